@@ -41,10 +41,10 @@ if __name__ == '__main__':
     # To achieve this, we keep our OpInfo library behind that of Pytorch's and
     # we periodically update our OpInfo library by regenerating this file"""))
 
-    print("_functorch_lagging_meta = {")
+    print("_functorch_lagging_meta = frozenset({")
     for name, variant in supported:
         print(f'    {(name, variant)},')
-    print("}")
+    print("})")
 
     print(deindent("""\
 
@@ -54,5 +54,5 @@ if __name__ == '__main__':
 
 
     functorch_lagging_op_db = [
-        opinfo for opinfo in op_db if in_functorch_lagging_op_db(opinfo)
+        opinfo for opinfo in op_db if (opinfo.name, opinfo.variant_test_name) in _functorch_lagging_meta
     ]"""))
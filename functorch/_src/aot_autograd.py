@@ -2,8 +2,8 @@ import os
 import torch
 import torch.nn as nn
 from functorch import make_functional_with_buffers, make_fx
-from torch.fx.node import map_arg
 import torch.fx as fx
+from torch.fx.node import map_arg
 from torch.fx.proxy import GraphAppendingTracer
 from torch.fx import immutable_collections
 import torch.utils._pytree as pytree
@@ -40,29 +40,20 @@ def default_partition(fx_module: fx.GraphModule, _joint_inputs):
     for n in fx_module.graph.nodes:
         if n.op == 'placeholder' and 'tangents' in n.target:
             bw_nodes.add(n)
-        elif n.op != 'output':
-            has_color = False
-
-            def is_colored(a):
-                nonlocal has_color
-                if a in bw_nodes or a in saved_nodes:
-                    has_color = True
-
-            def add_saved(a):
-                if a not in bw_nodes:
-                    saved_nodes.add(a)
-            map_arg(n.args, lambda x: is_colored(x))
-            map_arg(n.kwargs, lambda x: is_colored(x))
-            if has_color:
-                bw_nodes.add(n)
-                map_arg(n.args, lambda x: add_saved(x))
-                map_arg(n.kwargs, lambda x: add_saved(x))
         elif n.op == 'output':
             output_node = n
+        else:
+            # A node belongs to the backward if it consumes anything already
+            # colored; its remaining forward inputs then have to be saved.
+            inputs = n.all_input_nodes
+            if any(i in bw_nodes or i in saved_nodes for i in inputs):
+                bw_nodes.add(n)
+                saved_nodes.update(i for i in inputs if i not in bw_nodes)
 
     num_fwd_outputs = fx_module._out_spec.children_specs[0].num_leaves
     num_bwd_outputs = fx_module._out_spec.children_specs[1].num_leaves
     bw_outputs = output_node.args[0][num_fwd_outputs:]
+    bw_output_set = set(bw_outputs)
 
     bw_graph = fx.Graph()
     value_remap = {}
@@ -70,7 +61,7 @@ def default_partition(fx_module: fx.GraphModule, _joint_inputs):
         value_remap[saved_node] = bw_graph.placeholder(saved_node.name)
 
     for node in fx_module.graph.nodes:
-        if node in bw_nodes or node in bw_outputs:
+        if node in bw_nodes or node in bw_output_set:
             value_remap[node] = bw_graph.node_copy(node, lambda n: value_remap[n])
 
     assert(num_fwd_outputs + num_bwd_outputs == len(output_node.args[0]))
@@ -131,19 +122,11 @@ def _extract_graph_with_inputs_outputs(joint_graph, inputs, outputs):
         elif node.op == 'placeholder':
             env[node] = InvalidNode
         elif node.op == 'call_function':
-            def map_arg_to_proxy(x):
-                if isinstance(x, fx.Node):
-                    out = env[x]
-                    return out
-                else:
-                    return x
-            all_args = pytree.tree_flatten((node.args, node.kwargs))[0]
-            all_args = [isinstance(env[x], InvalidNodeBase) for x in all_args if isinstance(x, fx.Node)]
-            if any(all_args):
+            if any(env[x] is InvalidNode for x in node.all_input_nodes):
                 env[node] = InvalidNode
                 continue
-            args = pytree.tree_map(map_arg_to_proxy, node.args)
-            kwargs = pytree.tree_map(map_arg_to_proxy, node.kwargs)
+            args = map_arg(node.args, lambda x: env[x])
+            kwargs = map_arg(node.kwargs, lambda x: env[x])
             out = node.target(*args, **kwargs)
             env[node] = out
         elif node.op == 'get_attr':
@@ -168,44 +151,51 @@ def partition_with_recompute_fwd_in_bwd(joint_module: fx.GraphModule, _joint_inp
     resulting graphs through dead code elimintation.
     """
 
-    def is_primal(node):
-        return node.op == "placeholder" and "tangents" not in node.target
+    random_ops = set([torch.ops.aten.rand_like])
+
+    # Classify all the nodes we care about in a single pass over the graph
+    primal_inputs = []
+    tangent_inputs = []
+    random_nodes = []
+    output_node = None
+    for node in joint_module.graph.nodes:
+        if node.op == 'placeholder':
+            if "tangents" in node.target:
+                tangent_inputs.append(node)
+            else:
+                primal_inputs.append(node)
+        elif node.op == 'output':
+            output_node = node
+        elif node.target in random_ops:
+            random_nodes.append(node)
 
-    def is_tangent(node):
-        return node.op == "placeholder" and "tangents" in node.target
-    nodes = joint_module.graph.nodes
     num_fwd_outputs = joint_module._out_spec.children_specs[0].num_leaves
-    outputs = pytree.tree_flatten([node.args for node in nodes if node.op == 'output'])[0]
+    # make_fx flattens the joint outputs, so the output node holds the leaves directly
+    outputs = list(output_node.args[0])
     fwd_outputs = outputs[:num_fwd_outputs]
     bwd_outputs = outputs[num_fwd_outputs:]
 
-    saved_values = list(filter(is_primal, nodes))
-
-    random_ops = set([torch.ops.aten.rand_like])
-    random_nodes = list(filter(lambda x: x.target in random_ops, nodes))
+    saved_values = primal_inputs + random_nodes
+
+    # Filter out saved values that don't actually end up being used by the
+    # backwards pass: walk back from the backward outputs, stopping at the
+    # inputs of the backward graph.
+    bwd_inputs = set(saved_values + tangent_inputs)
+    used_nodes = set()
+    stack = [node for node in bwd_outputs if isinstance(node, fx.Node)]
+    while stack:
+        node = stack.pop()
+        if node in used_nodes:
+            continue
+        used_nodes.add(node)
+        if node not in bwd_inputs:
+            stack.extend(node.all_input_nodes)
+    saved_values = [node for node in saved_values if node in used_nodes]
 
-    for node in random_nodes:
-        saved_values.append(node)
-
-    primal_inputs = list(filter(is_primal, joint_module.graph.nodes))
-    tangent_inputs = list(filter(is_tangent, joint_module.graph.nodes))
     # Construct the forward module
     fwd_graph = _extract_graph_with_inputs_outputs(joint_module.graph, primal_inputs, fwd_outputs + saved_values)
     bwd_graph = _extract_graph_with_inputs_outputs(joint_module.graph, saved_values + tangent_inputs, bwd_outputs)
 
-    # This is to filter out saved values that don't actually end up being used by the backwards pass
-    for node in bwd_graph.nodes:
-        if node.op == 'placeholder' and not node.users:
-            for saved_value in saved_values:
-                if saved_value.name == node.name:
-                    saved_values.remove(saved_value)
-                    break
-
-    # Now, we re-generate the fwd/bwd graphs.
-    # NB: This might increase compilation time, but I doubt it matters
-    fwd_graph = _extract_graph_with_inputs_outputs(joint_module.graph, primal_inputs, fwd_outputs + saved_values)
-    bwd_graph = _extract_graph_with_inputs_outputs(joint_module.graph, saved_values + tangent_inputs, bwd_outputs)
-
     fwd_module = fx.GraphModule(joint_module, fwd_graph)
     bwd_module = fx.GraphModule(joint_module, bwd_graph)
 
@@ -215,7 +205,8 @@ def partition_with_recompute_fwd_in_bwd(joint_module: fx.GraphModule, _joint_inp
 def create_joint_forward_backward(fn):
     def joint_forward_backward(primals, tangents):
         out = fn(*primals)
-        primals = [p for p in pytree.tree_flatten(primals)[0] if p.requires_grad]
+        # primals are the already-flattened args, so there's no need to re-flatten them here
+        primals = [p for p in primals if p.requires_grad]
         backward_out = []
         if primals:  # todo(chilli): Make it support it if not all outputs have gradients
             backward_out = torch.autograd.grad(out, primals, grad_outputs=tangents, allow_unused=True)
@@ -228,37 +219,41 @@ def draw_joint_graph(graph, joint_inputs, file_name="full_graph.png"):
     return default_partition(graph, joint_inputs)
 
 
-def normalize_as_list(x):
-    if isinstance(x, tuple):
-        return list(x)
-    elif isinstance(x, list):
+def normalize_as_seq(x):
+    # Compiled graphs return either a tuple/list of outputs or a single
+    # output; callers only slice/iterate the result, so avoid copying.
+    if isinstance(x, (tuple, list)):
         return x
-    return [x]
+    return (x,)
 
 
-def create_compiled_function(flat_fn, fw_compiler, bw_compiler, partition_fn, decompose):
+# putting these decompositions here since they shouldn't always be used.
+# They're only consulted while tracing under `pythonkey_decompose()`, so
+# registering them once at import is enough.
+# Kinda sketchy ... we use torch.sub here to have the correct scalar => tensor promotion logic
+@register_decomposition(aten.rsub)
+def rsub(a, b, alpha=1):
+    return -aten.sub(a, b)
 
-    # putting these decompositions here since they shouldn't always be used
-    # Kinda sketchy ... we use torch.sub here to have the correct scalar => tensor promotion logic
-    @register_decomposition(aten.rsub)
-    def rsub(a, b, alpha=1):
-        return -aten.sub(a, b)
 
-    # This is only valid if we're running the graph without autograd, such as if the backward pass has been traced.
-    @register_decomposition(aten.detach)
-    def detach_decomposition(x):
-        return x
+# This is only valid if we're running the graph without autograd, such as if the backward pass has been traced.
+@register_decomposition(aten.detach)
+def detach_decomposition(x):
+    return x
+
 
+def create_compiled_function(flat_fn, fw_compiler, bw_compiler, partition_fn, decompose):
     joint_forward_backward = create_joint_forward_backward(flat_fn)
 
     compiled_fw = None
     compiled_bw = None
     num_outs = None
+    grad_positions = None
 
     class CompiledFunction(torch.autograd.Function):
         @staticmethod
         def forward(ctx, *flat_args):
-            nonlocal compiled_fw, compiled_bw, num_outs
+            nonlocal compiled_fw, compiled_bw, num_outs, grad_positions
             if compiled_fw is None:
                 out = flat_fn(*flat_args)
                 if isinstance(out, (list, tuple)):
@@ -277,11 +272,14 @@ def create_compiled_function(flat_fn, fw_compiler, bw_compiler, partition_fn, de
                 # print(fw_module.code, bw_module.code)
 
                 compiled_fw = fw_compiler(fw_module, flat_args)
-                fw_outs = normalize_as_list(compiled_fw(*flat_args))
+                fw_outs = normalize_as_seq(compiled_fw(*flat_args))
 
                 bw_args = fw_outs[num_outs:] + fw_outs[0:num_outs]
                 compiled_bw = bw_compiler(bw_module, bw_args)
-            fw_outs = normalize_as_list(compiled_fw(*flat_args))
+                # The backward graph only returns gradients for the inputs that required them
+                grad_positions = tuple(idx for idx, p in enumerate(ctx.needs_input_grad) if p)
+            else:
+                fw_outs = normalize_as_seq(compiled_fw(*flat_args))
             ctx.save_for_backward(*fw_outs[num_outs:])
             return tuple(fw_outs[0:num_outs])
 
@@ -289,9 +287,10 @@ def create_compiled_function(flat_fn, fw_compiler, bw_compiler, partition_fn, de
         def backward(ctx, *flat_args):
             # hmm... this doesn't feel right. todo
             contiguous_args = [t.contiguous() for t in flat_args]
-            out = normalize_as_list(compiled_bw(*ctx.saved_tensors, *contiguous_args))
-            out_iter = iter(out)
-            grad_out = [next(out_iter) if p else None for p in ctx.needs_input_grad]
+            out = normalize_as_seq(compiled_bw(*ctx.saved_tensors, *contiguous_args))
+            grad_out = [None] * len(ctx.needs_input_grad)
+            for idx, grad in zip(grad_positions, out):
+                grad_out[idx] = grad
             return tuple(grad_out)
 
     return CompiledFunction
@@ -349,8 +348,9 @@ def compiled_function(
         nonlocal cached_res
         if HAS_TREE:
             flattened_args = tree.flatten((args, kwargs))
+            args_spec = None
         else:
-            flattened_args, _ = pytree.tree_flatten((args, kwargs))
+            flattened_args, args_spec = pytree.tree_flatten((args, kwargs))
         num_args = len(flattened_args)
         # Check if the fn is already compiled
         cached_res = compile_cache.at(fn_id, num_args, hasher_type, *flattened_args)
@@ -358,7 +358,9 @@ def compiled_function(
         # Compile the function and save it in the cache
         if cached_res is None:
             # Compile a new function
-            flattened_args, args_spec = pytree.tree_flatten((args, kwargs))
+            if args_spec is None:
+                # dm-tree doesn't produce a spec that pytree can unflatten
+                flattened_args, args_spec = pytree.tree_flatten((args, kwargs))
             out_spec = PytreeThunk()
 
             def flat_fn(*args):
@@ -1,7 +1,7 @@
 import torch
 from functools import partial
 from .aot_autograd import draw_graph
-import time
+import hashlib
 
 
 def ts_compile(fx_g, _):
@@ -70,13 +70,15 @@ def _tvm_compile(fx_module, example_inputs, name=None):
     tasks, task_weights = auto_scheduler.extract_tasks(mod['main'], params, target)
     for task in tasks:
         print(task.compute_dag)
-    if name is None:
-        log_file = f'{time.time()}.json'
-    else:
-        log_file = f'{name}.json'
+    # Key the tuning log on what's actually being tuned, so that re-compiling
+    # the same module (e.g. in a new process) reuses the existing records
+    fingerprint = hashlib.sha1(
+        "|".join([str(mod), str(target)] + [str(task.compute_dag) for task in tasks]).encode()
+    ).hexdigest()[:12]
+    log_file = f'{name or "anon"}.{fingerprint}.json'
     if len(tasks) != 0:
-        tuner = auto_scheduler.TaskScheduler(tasks, task_weights)
         if not os.path.exists(log_file):
+            tuner = auto_scheduler.TaskScheduler(tasks, task_weights)
             tune_option = auto_scheduler.TuningOptions(
                 num_measure_trials=10000,  # change this to 20000 to achieve the best performance
                 measure_callbacks=[auto_scheduler.RecordToFile(log_file)],
@@ -103,7 +105,7 @@ def _tvm_compile(fx_module, example_inputs, name=None):
 
 
 def tvm_compile(name):
-    return partial(tvm_compile, name=name)
+    return partial(_tvm_compile, name=name)
 
 
 def nop(f, _):
@@ -130,18 +130,21 @@ def skip(op_name, variant_name=None, *, device_type=None, dtypes=None):
     return (op_name, variant_name, device_type, dtypes, False)
 
 
+# skipOps looks OpInfos up by name once per entry, so index them up front
+# instead of scanning every OpInfo for each entry.
+_all_opinfos_by_name = {}
+for _opinfo in functorch_lagging_op_db + additional_op_db:
+    _all_opinfos_by_name.setdefault(_opinfo.name, []).append(_opinfo)
+
+
 def skipOps(test_case_name, base_test_name, to_skip):
-    all_opinfos = functorch_lagging_op_db + additional_op_db
     for xfail in to_skip:
         op_name, variant_name, device_type, dtypes, expected_failure = xfail
-        if variant_name is None:
-            # match all variants
-            matching_opinfos = [o for o in all_opinfos if o.name == op_name]
-            assert len(matching_opinfos) >= 1, f"Couldn't find OpInfo for {xfail}"
-        else:
-            matching_opinfos = [o for o in all_opinfos
-                                if o.name == op_name and o.variant_test_name == variant_name]
-            assert len(matching_opinfos) >= 1, f"Couldn't find OpInfo for {xfail}"
+        matching_opinfos = _all_opinfos_by_name.get(op_name, [])
+        if variant_name is not None:
+            matching_opinfos = [o for o in matching_opinfos if o.variant_test_name == variant_name]
+        # a variant_name of None matches all variants
+        assert len(matching_opinfos) >= 1, f"Couldn't find OpInfo for {xfail}"
         for opinfo in matching_opinfos:
             decorators = list(opinfo.decorators)
             if expected_failure:
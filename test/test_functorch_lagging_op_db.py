@@ -10,6 +10,7 @@ from torch.testing._internal.common_device_type import (
 )
 from torch.testing._internal.common_utils import TestCase, run_tests
 from functorch_lagging_op_db import (
+    _functorch_lagging_meta,
     functorch_lagging_op_db,
     in_functorch_lagging_op_db,
 )
@@ -20,6 +21,15 @@ class TestFuncTorchLaggingOpDb(TestCase):
     def test_functorch_lagging_op_db_has_opinfos(self, device):
         self.assertEqual(len(functorch_lagging_op_db), len(op_db))
 
+    def test_no_stale_entries(self, device):
+        # Entries that PyTorch has since removed or renamed silently match nothing
+        current = {(opinfo.name, opinfo.variant_test_name) for opinfo in op_db}
+        stale = sorted(_functorch_lagging_meta - current)
+        self.assertEqual(
+            stale, [],
+            msg=f"{stale} are in functorch's OpInfo db but no longer in PyTorch's. "
+                "Please regenerate test/functorch_lagging_op_db.py")
+
     @ops(op_db, allowed_dtypes=(torch.float,))
     def test_coverage(self, device, dtype, op):
         if in_functorch_lagging_op_db(op):
@@ -429,6 +429,26 @@ class TestPartitioning(TestCase):
         assert torch.allclose(ref_a.grad, res_a.grad, atol=1e-3, rtol=1e-3)
         assert torch.allclose(ref_b.grad, res_b.grad, atol=1e-3, rtol=1e-3)
 
+    def test_recompute_partitioning_saved_values(self):
+        def fn(a, b):
+            return torch.sin(a) + b
+
+        bw_modules = []
+
+        def bw_compile(x, _):
+            bw_modules.append(x)
+            return x
+
+        compiled_fn = compiled_function(fn, _nop_compile, bw_compile, partition_with_recompute_fwd_in_bwd)
+        a = torch.randn(4, requires_grad=True)
+        b = torch.randn(4, requires_grad=True)
+        compiled_fn(a, b).sum().backward()
+        self.assertEqual(a.grad, torch.cos(a))
+        self.assertEqual(b.grad, torch.ones(4))
+        # Only `a` is needed to recompute the backward; `b` shouldn't be saved
+        placeholders = [n for n in bw_modules[0].graph.nodes if n.op == 'placeholder']
+        self.assertEqual(len(placeholders), 2)
+
 
 only_for = ("cpu")
 instantiate_device_type_tests(